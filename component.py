@@ -1,5 +1,15 @@
+import re
+
 from statement import Statement
 
+# Accesses of the ctx or outputs in a method body, that are not made through a linked keyword.
+HIDDEN_EFFECT_PATTERN = re.compile(r'self\.ctx(?!\.\$\{)|self\.out(_many)?\(')
+
+# Awaitables put into the ctx, which are only resolved after the outline step has finished.
+AWAITABLE_PATTERN = re.compile(r'(ToContext|to_context)\(')
+AWAITABLE_KEY_PATTERN = re.compile(r'\s*(\$\{\w+\}|\w+)\s*=(?!=)')
+OUTPUT_KEYWORD_PATTERN = re.compile(r'\$\{(output\w*)\}$')
+
 
 class Component(object):
     """A Component, that can be added to a WorkChain."""
@@ -87,6 +97,63 @@ class OutlineComponent(Component):
 
         super(OutlineComponent, self).__init__(comp_type, statements)
 
+    @property
+    def ctx_inputs(self):
+        """The set of ctx variables read by this component, as set by linking its inputs."""
+        return self._get_linked_values('input')
+
+    @property
+    def ctx_outputs(self):
+        """The set of ctx variables written by this component, as set by linking its outputs."""
+        return self._get_linked_values('output')
+
+    @property
+    def ctx_awaitables(self):
+        """The set of ctx variables this component puts into the ctx as awaitables."""
+        values = set()
+        for statement in self._statements:
+            if statement.type != 'line':
+                continue
+            for key in get_awaitable_keys(statement.line) or []:
+                match = OUTPUT_KEYWORD_PATTERN.match(key)
+                if match and statement.arguments.get(match.group(1)):
+                    values.add(statement.arguments[match.group(1)])
+        return values
+
+    @property
+    def has_hidden_effects(self):
+        """
+        Whether this component might have effects, that are not visible through its links.
+
+        This is the case if one of its inputs or outputs is not linked, if it has no inputs or
+        outputs at all, if its body accesses the ctx or outputs without a keyword or if it puts
+        awaitables into the ctx with a key, that is not an output keyword.
+        """
+        linked = False
+        for statement in self._statements:
+            for keyword in statement.keywords:
+                if keyword.startswith('input') or keyword.startswith('output'):
+                    if not statement.arguments.get(keyword):
+                        return True
+                    linked = True
+
+            if statement.type == 'line' and HIDDEN_EFFECT_PATTERN.search(statement.line):
+                return True
+
+            if statement.type == 'line' and has_hidden_awaitables(statement.line):
+                return True
+
+        return not linked
+
+    def _get_linked_values(self, prefix):
+        """Get the values of all linked keywords starting with prefix."""
+        values = set()
+        for statement in self._statements:
+            for keyword in statement.keywords:
+                if keyword.startswith(prefix) and statement.arguments.get(keyword):
+                    values.add(statement.arguments[keyword])
+        return values
+
 
 class ClassMethodComponent(OutlineComponent):
 
@@ -95,6 +162,7 @@ class ClassMethodComponent(OutlineComponent):
         self.indent_modifier = [0, 0]
 
         name = init.get('name')
+        self.name = name
         block_type = 'class_methods'
         lines = init.get('_lines')
 
@@ -149,3 +217,53 @@ class EndBlockComponent(OutlineComponent):
             'end_block',
             outline_str='),'
         )
+
+
+def has_hidden_awaitables(line):
+    """Whether a line puts awaitables into the ctx with a key, that is not an output keyword."""
+    keys = get_awaitable_keys(line)
+    if keys is None:
+        return True
+
+    for key in keys:
+        if not OUTPUT_KEYWORD_PATTERN.match(key):
+            return True
+
+    return False
+
+
+def get_awaitable_keys(line):
+    """
+    Get the keys of all awaitables put into the ctx in a line by `ToContext(...)` or `to_context(...)`.
+
+    :return: The list of keys or None, if any argument has no key, e.g. `ToContext(**awaitables)`,
+             or the call does not end on this line.
+    """
+    keys = []
+    for match in AWAITABLE_PATTERN.finditer(line):
+        # Split the arguments of the call at the commas outside of any nested brackets.
+        arguments = ['']
+        depth = 0
+        for char in line[match.end():]:
+            if depth == 0 and char == ')':
+                break
+            if char in '([{':
+                depth += 1
+            elif char in ')]}':
+                depth -= 1
+            if depth == 0 and char == ',':
+                arguments.append('')
+            else:
+                arguments[-1] += char
+        else:
+            return None
+
+        for argument in arguments:
+            if not argument.strip():
+                continue
+            key = AWAITABLE_KEY_PATTERN.match(argument)
+            if key is None:
+                return None
+            keys.append(key.group(1))
+
+    return keys
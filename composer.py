@@ -27,9 +27,14 @@ class WorkChainComposer(object):
 
         self.add_component('class_definition', {'name': name, 'import': base_class})
 
-    def implement(self):
-        """Implement the python script representation of the WorkChain."""
-        self._workchain_template.write()
+    def implement(self, parallel=False):
+        """
+        Implement the python script representation of the WorkChain.
+
+        :param parallel: Group outline methods, that do not depend on each other through
+                         the context, into a single outline step to run them concurrently.
+        """
+        self._workchain_template.write(parallel)
 
     def add_component(self, comp_type, init, index=None):
         """
@@ -61,6 +66,10 @@ class WorkChainComposer(object):
         """
         self._workchain_template.link_components(output_node, output_index, input_node, input_index, name)
 
-    def show_outline(self):
+    def show_outline(self, parallel=False):
         """Show the current outline of the WorkChain."""
-        self._workchain_template.show_outline()
+        self._workchain_template.show_outline(parallel)
+
+    def show_parallel_steps(self):
+        """Show the outline methods, that could run concurrently."""
+        self._workchain_template.show_parallel_steps()
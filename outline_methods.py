@@ -23,8 +23,14 @@ def yet_another_method(self):
 def add(self):
     self.ctx.${output1} = self.ctx.${input1} + self.ctx.${input2}
 
+
 def multiply(self):
     self.ctx.${output1} = self.ctx.${input1} * self.ctx.${input2}
 
+
+def subtract(self):
+    self.ctx.${output1} = self.ctx.${input1} - self.ctx.${input2}
+
+
 def result(self):
     self.out(${input1}, Int(self.ctx.${input1}))
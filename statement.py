@@ -42,6 +42,7 @@ class Statement(object):
         if line is None:
             line = TEMPLATES.get(statement_type)
 
+        self.line = line
         self._template = Template(line)
 
         # Set all potential keywords for this template. The list that
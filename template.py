@@ -13,6 +13,7 @@ BLOCK_TYPES = [
     ('define_outline', 2),
     ('define_outputs', 2),
     ('class_methods', 1),
+    ('parallel_methods', 1),
 ]
 
 BLOCK_TEMPLATES = {
@@ -24,6 +25,8 @@ BLOCK_TEMPLATES = {
 
 OUTLINE_COMPONENTS = ['begin_block', 'outline_method', 'end_block']
 
+PARALLEL_METHOD_PREFIX = 'parallel_'
+
 
 class WorkChainTemplate(object):
     """The template for a WorkChain."""
@@ -76,49 +79,211 @@ class WorkChainTemplate(object):
         for component in self._components:
             print component
 
-    def write(self):
-        """Write the python script representation of the WorkChain."""
+    def find_parallel_steps(self):
+        """
+        Find the outline methods that could run concurrently.
+
+        :return: A list of groups of adjacent outline method components. The methods within
+                 a group do not depend on each other through the ctx and can be run in parallel.
+        """
+        parallel_steps = []
+        for segment in self._get_outline_segments():
+            if isinstance(segment, list):
+                parallel_steps += [group for group in get_parallel_groups(segment) if len(group) > 1]
+
+        return parallel_steps
+
+    def show_parallel_steps(self):
+        """Print the outline methods that could run concurrently with their component indices."""
+        for index, group in enumerate(self.find_parallel_steps()):
+            methods = ['{0} ({1})'.format(method.name, self._components.index(method)) for method in group]
+            print '{0}: {1}'.format(index, ', '.join(methods))
+
+    def write(self, parallel=False):
+        """
+        Write the python script representation of the WorkChain.
+
+        :param parallel: Group independent outline methods into a single outline step.
+        """
 
         # Create the outline first, since it has to be updated every time.
-        self.create_outline()
+        self.create_outline(parallel)
 
         for block_type, _ in BLOCK_TYPES:
             self.blocks[block_type].write()
 
-    def show_outline(self):
+    def show_outline(self, parallel=False):
         """Print the outline of the WorkChain."""
-        self.create_outline()
+        self.create_outline(parallel)
         self.blocks['define_outline'].write()
 
-    def create_outline(self):
-        """Create the outline of the WorkChain."""
+    def create_outline(self, parallel=False):
+        """
+        Create the outline of the WorkChain.
+
+        :param parallel: Group adjacent independent outline methods into a single outline
+                         step. The methods of a group are called from a common method, so the
+                         sub WorkChains they submit will run concurrently. The order of the
+                         methods in the outline is preserved.
+        """
         block = Block('define_outline', 2)
+        self.blocks['parallel_methods'] = Block('parallel_methods', 1)
         indent = 1
 
         block.add_statement(Statement('comment', 'define_outline', init={'comment': 'spec.outline('}))
 
-        for component in self._components:
-            if component.type not in OUTLINE_COMPONENTS:
-                # Component, that does not contribute to the outline.
+        for segment in self._get_outline_segments():
+            if not isinstance(segment, list):
+                # Beginning or end of an outline block.
+                indent += segment.indent_modifier[0]
+                block.add_statement(Statement('comment',
+                                              'define_outline',
+                                              indent=indent,
+                                              init={'comment': segment.outline_str}
+                                              ))
+                indent += segment.indent_modifier[1]
                 continue
 
-            indent += component.indent_modifier[0]
+            if parallel:
+                steps = get_parallel_groups(segment)
+            else:
+                steps = [[method] for method in segment]
 
-            # Add the components outline string to the outline.
-            block.add_statement(Statement('comment',
-                                          'define_outline',
-                                          indent=indent,
-                                          init={'comment': component.outline_str}
-                                          ))
+            for step in steps:
+                if len(step) == 1:
+                    outline_str = step[0].outline_str
+                else:
+                    outline_str = 'cls.' + self._add_parallel_method(step) + ','
 
-            indent += component.indent_modifier[1]
+                # Add the components outline string to the outline.
+                block.add_statement(Statement('comment',
+                                              'define_outline',
+                                              indent=indent,
+                                              init={'comment': outline_str}
+                                              ))
 
         block.add_statement(Statement('comment', 'define_outline', init={'comment': ')'}))
 
         self.blocks['define_outline'] = block
 
+    def _get_outline_segments(self):
+        """
+        Split the outline into its block components and lists of consecutive outline methods.
 
+        Outline methods are only grouped within a list, since the beginning and end of an
+        outline block can not be reordered.
+        """
+        segments = []
+        methods = []
 
+        for component in self._components:
+            if component.type not in OUTLINE_COMPONENTS:
+                # Component, that does not contribute to the outline.
+                continue
 
+            if component.type == 'outline_method':
+                methods.append(component)
+                continue
 
-
+            if methods:
+                segments.append(methods)
+                methods = []
+            segments.append(component)
+
+        if methods:
+            segments.append(methods)
+
+        return segments
+
+    def _add_parallel_method(self, methods):
+        """
+        Add a class method calling all methods of a parallel step and return its name.
+
+        Any awaitables returned by the methods are collected in the context. Any other
+        return value, e.g. an exit code, is returned without calling the remaining methods.
+        """
+        name = PARALLEL_METHOD_PREFIX + '_'.join(method.name for method in methods)
+        block = self.blocks['parallel_methods']
+
+        for statement in block.all_statements:
+            if statement.type == 'definition' and statement.arguments['name'] == name:
+                # The same group of methods has already been added.
+                return name
+
+        steps = ', '.join('self.' + method.name for method in methods)
+
+        if block.all_statements:
+            # Separate this method from the previous one.
+            block.add_statement(Statement('line', 'parallel_methods', line=''))
+
+        block.add_statement(Statement('definition', 'parallel_methods', init={
+            'keyword': 'def',
+            'name': name,
+            'arguments': 'self',
+        }))
+        for indent, line in [
+            (1, 'for step in ({0},):'.format(steps)),
+            (2, 'awaitables = step()'),
+            (2, 'if isinstance(awaitables, dict):'),
+            (3, 'self.to_context(**awaitables)'),
+            (2, 'elif awaitables is not None:'),
+            (3, 'return awaitables'),
+        ]:
+            block.add_statement(Statement('comment', 'parallel_methods', indent=indent, init={'comment': line}))
+
+        return name
+
+
+def get_dataflow_graph(methods):
+    """
+    Build the ctx dataflow graph for a list of consecutive outline methods.
+
+    A method depends on an earlier method, if it reads a ctx variable the earlier
+    method writes, or if it writes a ctx variable the earlier method reads or writes.
+    A method also depends on an earlier method, that puts a ctx variable it reads into
+    the ctx as an awaitable, since awaitables are only resolved after the whole outline
+    step has finished. Methods with effects, that are not visible through their links,
+    depend on all earlier methods and all later methods depend on them.
+
+    :param methods: The outline method components in the order of the outline.
+    :return: A list containing for each method the set of indices of the methods it depends on.
+    """
+    graph = []
+    for index, method in enumerate(methods):
+        dependencies = set()
+        for previous_index, previous in enumerate(methods[:index]):
+            if (method.has_hidden_effects or previous.has_hidden_effects or
+                    previous.ctx_awaitables & method.ctx_inputs or
+                    previous.ctx_outputs & method.ctx_inputs or
+                    previous.ctx_inputs & method.ctx_outputs or
+                    previous.ctx_outputs & method.ctx_outputs):
+                dependencies.add(previous_index)
+        graph.append(dependencies)
+
+    return graph
+
+
+def get_parallel_groups(methods):
+    """
+    Group a list of consecutive outline methods by their ctx dataflow.
+
+    Dependencies always point to earlier methods, so the outline order is a topological
+    order of the dataflow graph. Each group is a maximal run of adjacent methods, that do
+    not depend on each other, which keeps the order of the methods in the outline.
+
+    :param methods: The outline method components in the order of the outline.
+    :return: A list of groups, each being a list of methods that only depend on methods
+             of previous groups.
+    """
+    groups = []
+    group_indices = set()
+
+    for index, dependencies in enumerate(get_dataflow_graph(methods)):
+        if not groups or dependencies & group_indices:
+            groups.append([])
+            group_indices = set()
+
+        groups[-1].append(methods[index])
+        group_indices.add(index)
+
+    return groups